@@ -0,0 +1,4 @@
+import logging
+
+# Library modules log under "src"; the application decides where records go
+logging.getLogger(__name__).addHandler(logging.NullHandler())
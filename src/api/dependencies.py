@@ -0,0 +1,25 @@
+from fastapi import Request
+from src.services.cv_analyzer import CVAnalyzer
+from src.services.interview_generator import InterviewGenerator
+from src.services.matching_service import MatchingService
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+def get_cv_analyzer(request: Request) -> CVAnalyzer:
+    """Dependency returning the shared CV analyzer created at startup."""
+    return request.app.state.cv_analyzer
+
+def get_interview_generator(request: Request) -> InterviewGenerator:
+    """Dependency returning the shared interview generator created at startup."""
+    return request.app.state.interview_generator
+
+def get_matching_service(request: Request) -> MatchingService:
+    """Dependency returning the shared matching service created at startup."""
+    return request.app.state.matching_service
+
+def get_scraper(request: Request) -> LinkedInScraper:
+    """Dependency returning the shared LinkedIn scraper created at startup."""
+    return request.app.state.scraper
+
+def get_redis(request: Request):
+    """Dependency returning the shared Redis client, or None if caching is disabled."""
+    return request.app.state.redis
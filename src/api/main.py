@@ -1,11 +1,26 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import logging
+import os
 import uvicorn
 from src.services.cv_analyzer import CVAnalyzer
 from src.services.interview_generator import InterviewGenerator
 from src.services.matching_service import MatchingService
 from src.scrapers.linkedin_scraper import LinkedInScraper
+from src.api.routes.cv import MAX_UPLOAD_SIZE
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis caching is optional
+    aioredis = None
+
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
 
 # Global service instances
 cv_analyzer = CVAnalyzer()
@@ -16,26 +31,59 @@ linkedin_scraper = LinkedInScraper()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("Starting Job Scraper and Interview Assistant Platform...")
+    logger.info("Starting Job Scraper and Interview Assistant Platform...")
+    # Share one instance of each service across all requests
+    app.state.cv_analyzer = cv_analyzer
+    app.state.interview_generator = interview_generator
+    app.state.matching_service = matching_service
+    app.state.scraper = linkedin_scraper
+    
+    # Materialize the static HTML samples once instead of per request
+    await linkedin_scraper.load_sample_paths()
+    
+    # Optional Redis client for response caching
+    redis_url = os.getenv("REDIS_URL")
+    app.state.redis = aioredis.from_url(redis_url) if redis_url and aioredis else None
     yield
     # Shutdown
-    print("Shutting down...")
+    logger.info("Shutting down...")
+    await linkedin_scraper.close()
+    await cv_analyzer.close()
+    await interview_generator.close()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
 
 app = FastAPI(
     title="Job Scraper and Interview Assistant Platform",
     description="A platform for scraping jobs, analyzing CVs, and generating interview questions",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS middleware (skipped entirely for internal deployments); without an
+# ALLOWED_ORIGINS allowlist no cross-origin requests are allowed
+if not os.getenv("DISABLE_CORS"):
+    allowed_origins = [
+        origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()
+    ]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_methods=["GET", "POST"],
+        allow_headers=["authorization", "content-type"],
+    )
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized request bodies before they are read into the worker."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
+        return ORJSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds {MAX_UPLOAD_SIZE // (1024 * 1024)} MB limit"}
+        )
+    return await call_next(request)
 
 # Include routers
 from src.api.routes.jobs import router as jobs_router
@@ -55,4 +103,14 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # CV vector stores are per process, so more than one worker (WEB_CONCURRENCY)
+    # is only safe with sticky per-tenant routing
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "src.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
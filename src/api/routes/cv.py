@@ -1,40 +1,97 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi.responses import ORJSONResponse
 from typing import Optional
+import asyncio
+import codecs
+import os
+import tempfile
 import uuid
+from src.api.dependencies import get_cv_analyzer
 from src.services.cv_analyzer import CVAnalyzer
 from src.models.cv import CV, CVAnalysisResult
 from src.models.job import Job
 
 router = APIRouter()
-analyzer = CVAnalyzer()
+
+# Uploads are copied/decoded in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Reject request bodies/uploads larger than this (CV uploads)
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10")) * 1024 * 1024
+
+def _upload_too_large(max_size: int) -> HTTPException:
+    """413 error for uploads over the size limit."""
+    return HTTPException(status_code=413, detail=f"Upload exceeds {max_size // (1024 * 1024)} MB limit")
+
+def _spool_to_tempfile(upload_file, max_size: int = MAX_UPLOAD_SIZE) -> str:
+    """Copy an uploaded file to a temporary file on disk and return its path.
+    
+    The byte count is enforced while copying, since chunked uploads carry no
+    Content-Length for the middleware to check.
+    """
+    upload_file.seek(0)
+    size = 0
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        while chunk := upload_file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                break
+            tmp.write(chunk)
+    
+    if size > max_size:
+        os.unlink(tmp.name)
+        raise _upload_too_large(max_size)
+    return tmp.name
+
+async def _read_text_upload(file: UploadFile, max_size: int = MAX_UPLOAD_SIZE) -> str:
+    """Decode a UTF-8 upload incrementally instead of buffering the raw bytes."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    parts = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise _upload_too_large(max_size)
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    return "".join(parts)
 
 @router.post("/upload", response_model=CV)
 async def upload_cv(
     file: UploadFile = File(...),
-    tenant_id: Optional[str] = Form(None)
+    tenant_id: Optional[str] = Form(None),
+    analyzer: CVAnalyzer = Depends(get_cv_analyzer)
 ):
     """Upload and process a CV (PDF or text)."""
     try:
         cv_id = str(uuid.uuid4())
         
         if file.content_type == "application/pdf":
-            content = await file.read()
-            cv = await analyzer.process_pdf_cv(content, cv_id, tenant_id)
+            pdf_path = await asyncio.to_thread(_spool_to_tempfile, file.file)
+            try:
+                cv = await analyzer.process_pdf_cv_path(pdf_path, cv_id, tenant_id)
+            finally:
+                os.unlink(pdf_path)
         else:
-            content = await file.read()
-            text_content = content.decode('utf-8')
+            text_content = await _read_text_upload(file)
             cv = await analyzer.process_cv(text_content, cv_id, tenant_id)
         
         return cv
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing CV: {str(e)}")
 
 @router.post("/analyze", response_model=CVAnalysisResult)
-async def analyze_cv_job_match(cv: CV, job: Job):
+async def analyze_cv_job_match(
+    cv: CV,
+    job: Job,
+    analyzer: CVAnalyzer = Depends(get_cv_analyzer)
+):
     """Analyze how well a CV matches a job posting."""
     try:
         analysis = await analyzer.analyze_cv_job_match(cv, job)
-        return analysis
+        return ORJSONResponse(content=analysis.model_dump(mode="json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing CV: {str(e)}")
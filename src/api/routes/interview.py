@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from src.api.dependencies import get_cv_analyzer, get_interview_generator, get_matching_service
 from src.services.matching_service import MatchingService
 from src.services.cv_analyzer import CVAnalyzer
 from src.services.interview_generator import InterviewGenerator
@@ -7,16 +8,18 @@ from src.models.job import Job
 from src.models.interview import InterviewAssessment
 
 router = APIRouter()
-cv_analyzer = CVAnalyzer()
-interview_generator = InterviewGenerator()
-matching_service = MatchingService(cv_analyzer, interview_generator)
 
 @router.post("/generate", response_model=InterviewAssessment)
-async def generate_interview_questions(cv: CV, job: Job):
+async def generate_interview_questions(
+    cv: CV,
+    job: Job,
+    cv_analyzer: CVAnalyzer = Depends(get_cv_analyzer),
+    interview_generator: InterviewGenerator = Depends(get_interview_generator)
+):
     """Generate interview questions based on CV-job match."""
     try:
-        # First analyze the CV-job match
-        cv_analysis = await cv_analyzer.analyze_cv_job_match(cv, job)
+        # Score the CV-job match; the LLM summary is not part of this response
+        cv_analysis = await cv_analyzer.score_cv_job_match(cv, job)
         
         # Generate interview assessment
         assessment = await interview_generator.generate_interview_assessment(cv_analysis, job)
@@ -27,7 +30,11 @@ async def generate_interview_questions(cv: CV, job: Job):
         raise HTTPException(status_code=500, detail=f"Error generating interview: {str(e)}")
 
 @router.post("/complete-assessment")
-async def complete_assessment(cv: CV, job: Job):
+async def complete_assessment(
+    cv: CV,
+    job: Job,
+    matching_service: MatchingService = Depends(get_matching_service)
+):
     """Get complete assessment including CV analysis and interview questions."""
     try:
         result = await matching_service.process_complete_assessment(cv, job)
@@ -1,21 +1,27 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Optional
+import logging
 import os
+import orjson
+from src.api.dependencies import get_redis, get_scraper
 from src.models.job import Job
 from src.scrapers.linkedin_scraper import LinkedInScraper
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-def get_scraper():
-    """Dependency to get LinkedIn scraper with SerpAPI key."""
-    return LinkedInScraper(serp_api_key=os.getenv("SERPAPI_KEY"))
+# Seconds a scrape result stays in the Redis cache
+JOBS_CACHE_TTL = int(os.getenv("JOBS_CACHE_TTL", "600"))
 
 @router.get("/scrape", response_model=List[Job])
 async def scrape_jobs(
     query: str = Query(..., description="Job search query (e.g., 'Python Developer')"),
     location: str = Query("", description="Job location (e.g., 'Remote', 'San Francisco')"),
     limit: int = Query(10, ge=1, le=50, description="Number of jobs to scrape"),
-    scraper: LinkedInScraper = Depends(get_scraper)
+    scraper: LinkedInScraper = Depends(get_scraper),
+    redis = Depends(get_redis)
 ):
     """
     Scrape jobs from LinkedIn using SerpAPI.
@@ -25,9 +31,21 @@ async def scrape_jobs(
     - **limit**: Maximum number of jobs to return (1-50)
     
     Returns a list of normalized job objects with skills extracted from descriptions.
+    SerpAPI results are cached in Redis for a few minutes when `REDIS_URL` is configured.
     """
+    cache_key = f"jobs:{query}:{location}:{limit}"
+    
+    if redis is not None:
+        try:
+            cached = await redis.get(cache_key)
+            if cached:
+                # Cached payload is already the serialized response body
+                return Response(content=cached, media_type="application/json")
+        except Exception:
+            logger.warning("Redis cache read failed", exc_info=True)
+    
     try:
-        jobs = await scraper.scrape_jobs(query, location, limit)
+        jobs, from_serpapi = await scraper.scrape_jobs_with_source(query, location, limit)
         
         if not jobs:
             raise HTTPException(
@@ -35,7 +53,16 @@ async def scrape_jobs(
                 detail="No jobs found. Please try different search terms or check your SerpAPI configuration."
             )
         
-        return jobs
+        body = orjson.dumps([job.model_dump(mode="json") for job in jobs])
+        
+        # Sample data served after a SerpAPI failure must not outlive the outage
+        if redis is not None and from_serpapi:
+            try:
+                await redis.set(cache_key, body, ex=JOBS_CACHE_TTL)
+            except Exception:
+                logger.warning("Redis cache write failed", exc_info=True)
+        
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
@@ -73,7 +100,7 @@ async def get_sample_jobs(scraper: LinkedInScraper = Depends(get_scraper)):
     """
     try:
         jobs = await scraper._scrape_from_samples()
-        return jobs
+        return ORJSONResponse(content=[job.model_dump(mode="json") for job in jobs])
     except Exception as e:
         raise HTTPException(
             status_code=500,
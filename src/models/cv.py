@@ -1,9 +1,11 @@
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 
 class CV(BaseModel):
     """CV model for structured CV data."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     id: str = Field(..., description="Unique CV identifier")
     content: str = Field(..., description="Full CV text content")
     skills: List[str] = Field(default_factory=list, description="Extracted skills")
@@ -13,6 +15,8 @@ class CV(BaseModel):
 
 class CVAnalysisResult(BaseModel):
     """CV analysis result model."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     cv_id: str
     extracted_skills: List[str]
     fit_score: int = Field(..., ge=0, le=100, description="Job fit score (0-100)")
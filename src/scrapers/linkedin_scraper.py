@@ -1,14 +1,147 @@
 import json
+import logging
 import re
 import os
 import asyncio
-from typing import List, Optional
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from pathlib import Path
 import aiofiles
-from bs4 import BeautifulSoup
+from cachetools import TTLCache
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from selectolax.lexbor import LexborHTMLParser
 from serpapi import GoogleSearch
 from src.scrapers.base import BaseJobScraper
 from src.models.job import Job
+from src.utils.batching import RequestCoalescer
+from src.utils.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional (x86 only); the regex path is used instead
+    hyperscan = None
+
+# Comprehensive list of technical skills (immutable, shared by every call)
+TECHNICAL_SKILLS: Tuple[str, ...] = (
+    # Programming Languages
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby', 'Swift', 'Kotlin',
+    
+    # Python Frameworks
+    'Django', 'Flask', 'FastAPI', 'Tornado', 'Pyramid', 'Bottle',
+    
+    # JavaScript Frameworks/Libraries  
+    'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Next.js', 'Nuxt.js',
+    
+    # Cloud Platforms
+    'AWS', 'Azure', 'GCP', 'Google Cloud', 'DigitalOcean', 'Heroku',
+    
+    # Databases
+    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'SQLite', 'DynamoDB', 'Cassandra',
+    
+    # DevOps & Tools
+    'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible',
+    
+    # Version Control
+    'Git', 'GitHub', 'GitLab', 'Bitbucket',
+    
+    # APIs & Architecture
+    'REST API', 'GraphQL', 'Microservices', 'gRPC', 'WebSocket',
+    
+    # Testing
+    'pytest', 'Jest', 'Selenium', 'Cypress', 'Unit Testing', 'Integration Testing',
+    
+    # Machine Learning
+    'Machine Learning', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter',
+    
+    # Other Technologies
+    'Linux', 'Unix', 'Nginx', 'Apache', 'RabbitMQ', 'Kafka', 'CI/CD'
+)
+
+_SKILL_MATCHER = SkillMatcher(TECHNICAL_SKILLS)
+
+# Validates a whole page of SerpAPI results in one call
+_JOB_LIST_ADAPTER = TypeAdapter(List[Job])
+
+# Patterns for skill variations the direct match would miss
+SKILL_PATTERNS = {
+    'CI/CD': r'\b(ci/cd|continuous integration|continuous deployment|continuous delivery)\b',
+    'REST API': r'\b(rest|restful|api)\b',
+    'Machine Learning': r'\b(ml|machine learning|artificial intelligence|ai)\b',
+    'Docker': r'\b(docker|containerization|containers)\b',
+    'Kubernetes': r'\b(kubernetes|k8s|orchestration)\b',
+    'AWS': r'\b(aws|amazon web services)\b',
+    'Azure': r'\b(azure|microsoft azure)\b',
+    'GCP': r'\b(gcp|google cloud|google cloud platform)\b'
+}
+
+# All patterns compiled into one alternation, one named group per skill
+_SKILL_PATTERN_NAMES = {f"skill{i}": skill for i, skill in enumerate(SKILL_PATTERNS)}
+_SKILL_PATTERNS_RE = re.compile("|".join(
+    f"(?P<{group}>{SKILL_PATTERNS[skill]})" for group, skill in _SKILL_PATTERN_NAMES.items()
+).encode())
+
+def _compile_skill_patterns_db():
+    """Compile SKILL_PATTERNS into a Hyperscan database, or None if unavailable."""
+    if hyperscan is None:
+        return None
+    
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern in SKILL_PATTERNS.values()],
+            ids=list(range(len(SKILL_PATTERNS))),
+            elements=len(SKILL_PATTERNS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(SKILL_PATTERNS)
+        )
+        return db
+    except Exception as e:
+        logger.warning("Hyperscan unavailable, using regex skill patterns: %s", e)
+        return None
+
+_SKILL_PATTERNS_DB = _compile_skill_patterns_db()
+_SKILL_PATTERN_IDS = tuple(SKILL_PATTERNS)
+# Hyperscan scratch space must not be shared between threads
+_hyperscan_local = threading.local()
+
+def _on_skill_pattern_match(pattern_id, start, end, flags, found_skills):
+    """Hyperscan match callback recording the matched skill."""
+    found_skills.add(_SKILL_PATTERN_IDS[pattern_id])
+
+def _scan_skill_patterns(text_bytes: bytes, found_skills: set):
+    """Scan text for all skill patterns in a single Hyperscan pass."""
+    scratch = getattr(_hyperscan_local, "scratch", None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(_SKILL_PATTERNS_DB)
+    
+    _SKILL_PATTERNS_DB.scan(
+        text_bytes,
+        match_event_handler=_on_skill_pattern_match,
+        context=found_skills,
+        scratch=scratch
+    )
+
+@lru_cache(maxsize=4096)
+def _extract_skills_cached(text: str) -> Tuple[str, ...]:
+    """Extract skills from text, memoized since descriptions repeat across endpoints."""
+    # Case-fold once; the skill table was lowercased at import
+    text_lower = text.lower()
+    
+    # Direct matching in a single pass over the text
+    found_skills = _SKILL_MATCHER.find_lowercase(text_lower)
+    
+    # Pattern-based matching for variations, on bytes to skip Unicode handling
+    text_bytes = text_lower.encode()
+    if _SKILL_PATTERNS_DB is not None:
+        _scan_skill_patterns(text_bytes, found_skills)
+    else:
+        for match in _SKILL_PATTERNS_RE.finditer(text_bytes):
+            found_skills.add(_SKILL_PATTERN_NAMES[match.lastgroup])
+    
+    return tuple(found_skills)[:12]  # Limit to top 12 skills
 
 class LinkedInScraper(BaseJobScraper):
     """LinkedIn job scraper using SerpAPI and HTML parsing support."""
@@ -16,17 +149,34 @@ class LinkedInScraper(BaseJobScraper):
     def __init__(self, serp_api_key: Optional[str] = None):
         self.serp_api_key = serp_api_key or os.getenv("SERPAPI_KEY")
         self.samples_path = Path("data/samples/linkedin/")
+        # Sample file listing, resolved once by load_sample_paths()
+        self._sample_paths: Optional[List[Path]] = None
+        # Identical searches issued concurrently share one SerpAPI call
+        self._serp_batcher = RequestCoalescer(self._dispatch_serp_search)
+        # Recent SerpAPI responses, keyed on the search parameters minus the API key
+        self._serp_cache = TTLCache(maxsize=256, ttl=300)
+    
+    async def close(self):
+        """Stop the SerpAPI request batcher."""
+        await self._serp_batcher.close()
     
     async def scrape_jobs(self, query: str, location: str = "", limit: int = 10) -> List[Job]:
         """Scrape LinkedIn jobs using SerpAPI or HTML samples."""
+        jobs, _ = await self.scrape_jobs_with_source(query, location, limit)
+        return jobs
+    
+    async def scrape_jobs_with_source(
+        self, query: str, location: str = "", limit: int = 10
+    ) -> Tuple[List[Job], bool]:
+        """Scrape jobs and report whether they came from SerpAPI (False for sample data)."""
         if self.serp_api_key:
             return await self._scrape_via_serpapi(query, location, limit)
         else:
-            print("No SerpAPI key found. Using HTML samples.")
-            return await self._scrape_from_samples()
+            logger.info("No SerpAPI key found. Using HTML samples.")
+            return await self._scrape_from_samples(), False
     
-    async def _scrape_via_serpapi(self, query: str, location: str, limit: int) -> List[Job]:
-        """Scrape jobs using SerpAPI."""
+    async def _scrape_via_serpapi(self, query: str, location: str, limit: int) -> Tuple[List[Job], bool]:
+        """Scrape jobs using SerpAPI; falls back to the samples (flagged False) on failure."""
         try:
             search_params = {
                 "engine": "google_jobs",
@@ -36,103 +186,127 @@ class LinkedInScraper(BaseJobScraper):
                 "api_key": self.serp_api_key
             }
             
-            # Run the search in a thread to avoid blocking
-            search_result = await asyncio.to_thread(self._perform_serp_search, search_params)
+            search_key = tuple(sorted(
+                (key, value) for key, value in search_params.items() if key != "api_key"
+            ))
+            search_result = self._serp_cache.get(search_key)
+            if search_result is None:
+                search_result = await self._serp_batcher.submit(search_key, search_params)
+                if "error" not in search_result:
+                    self._serp_cache[search_key] = search_result
             
-            jobs = []
             jobs_results = search_result.get("jobs_results", [])
             
-            for job_data in jobs_results[:limit]:
-                try:
-                    job = self._normalize_serp_job_data(job_data)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    print(f"Error processing job data: {e}")
-                    continue
-            
-            return jobs
+            # Map to Job-shaped rows, then validate the whole list in one call
+            rows = [self._serp_job_to_row(job_data) for job_data in jobs_results[:limit]]
+            return self._validate_job_rows([row for row in rows if row]), True
             
-        except Exception as e:
-            print(f"SerpAPI scraping error: {e}")
+        except Exception:
+            logger.exception("SerpAPI scraping error")
             # Fallback to samples if API fails
-            return await self._scrape_from_samples()
+            return await self._scrape_from_samples(), False
+    
+    def _validate_job_rows(self, rows: List[dict]) -> List[Job]:
+        """Validate rows as Jobs, dropping only the malformed ones."""
+        try:
+            return _JOB_LIST_ADAPTER.validate_python(rows)
+        except ValidationError:
+            # Fall back to per-row validation so one bad row doesn't discard the page
+            jobs = []
+            for row in rows:
+                try:
+                    jobs.append(Job.model_validate(row))
+                except ValidationError:
+                    logger.warning("Skipping invalid SerpAPI job %r", row.get("title"), exc_info=True)
+            return jobs
+    
+    async def _dispatch_serp_search(self, params: dict) -> dict:
+        """Run the search in a thread to avoid blocking."""
+        return await asyncio.to_thread(self._perform_serp_search, params)
     
     def _perform_serp_search(self, params: dict) -> dict:
         """Perform SerpAPI search (blocking operation)."""
-        search = GoogleSearch(params)
-        return search.get_dict()
+        search = GoogleSearch(dict(params, output="json"))
+        # Decode the raw body with orjson instead of the client's json.loads
+        return orjson.loads(search.get_response().content)
     
-    def _normalize_serp_job_data(self, job_data: dict) -> Optional[Job]:
-        """Normalize SerpAPI job data to Job model."""
-        try:
-            title = job_data.get("title", "")
-            company = job_data.get("company_name", "")
-            location = job_data.get("location", "")
-            description = job_data.get("description", "")
-            job_url = job_data.get("related_links", [{}])[0].get("link", "")
-            
-            if not title or not company:
-                return None
-            
-            # Extract requirements from description
-            requirements = self._extract_skills(description)
-            
-            return Job(
-                title=title,
-                company=company,
-                requirements=requirements,
-                location=location,
-                description=description,
-                url=job_url
-            )
-            
-        except Exception as e:
-            print(f"Error normalizing SerpAPI job data: {e}")
+    def _serp_job_to_row(self, job_data: dict) -> Optional[dict]:
+        """Map SerpAPI job data to a dict matching the Job model."""
+        title = job_data.get("title") or ""
+        company = job_data.get("company_name") or ""
+        
+        if not title or not company:
             return None
+        
+        description = job_data.get("description") or ""
+        related_links = job_data.get("related_links") or [{}]
+        
+        return {
+            "title": title,
+            "company": company,
+            # Extract requirements from description
+            "requirements": self._extract_skills(description),
+            "location": job_data.get("location") or "",
+            "description": description,
+            "url": related_links[0].get("link", "")
+        }
     
     async def _scrape_from_samples(self) -> List[Job]:
         """Scrape jobs from HTML samples (fallback method)."""
+        html_files = self._sample_paths
+        if html_files is None:
+            html_files = await self.load_sample_paths()
+        
+        # Read and parse all sample files concurrently
+        results = await asyncio.gather(
+            *(self._read_and_parse_sample(html_file) for html_file in html_files),
+            return_exceptions=True
+        )
+        
         jobs = []
+        for html_file, result in zip(html_files, results):
+            if isinstance(result, Exception):
+                logger.error("Error reading sample file %s", html_file, exc_info=result)
+            elif result:
+                jobs.append(result)
         
-        if not self.samples_path.exists():
-            # Create sample data if directory doesn't exist
+        return jobs
+    
+    async def load_sample_paths(self) -> List[Path]:
+        """Create the sample data if missing and cache the sample file listing."""
+        if not self.samples_path.exists() or not any(self.samples_path.glob("*.html")):
             await self._create_sample_data()
         
-        for html_file in self.samples_path.glob("*.html"):
-            try:
-                async with aiofiles.open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = await f.read()
-                
-                job = self._parse_html_job(html_content)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error reading sample file {html_file}: {e}")
-                continue
+        self._sample_paths = sorted(self.samples_path.glob("*.html"))
+        return self._sample_paths
+    
+    async def _read_and_parse_sample(self, html_file: Path) -> Optional[Job]:
+        """Read a sample file and parse it off the event loop."""
+        async with aiofiles.open(html_file, 'r', encoding='utf-8') as f:
+            html_content = await f.read()
         
-        return jobs
+        return await asyncio.to_thread(self._parse_html_job, html_content)
     
     def _parse_html_job(self, html_content: str) -> Optional[Job]:
         """Parse job data from LinkedIn HTML."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = LexborHTMLParser(html_content)
             
             # Extract job title
-            title_elem = soup.find('h1', class_='top-card-layout__title') or soup.find('h1')
-            title = title_elem.get_text(strip=True) if title_elem else "Software Developer"
+            title_elem = tree.css_first('h1.top-card-layout__title') or tree.css_first('h1')
+            title = title_elem.text(strip=True) if title_elem else "Software Developer"
             
             # Extract company
-            company_elem = soup.find('span', class_='topcard__flavor') or soup.find('a', class_='topcard__org-name-link')
-            company = company_elem.get_text(strip=True) if company_elem else "Tech Company"
+            company_elem = tree.css_first('span.topcard__flavor') or tree.css_first('a.topcard__org-name-link')
+            company = company_elem.text(strip=True) if company_elem else "Tech Company"
             
             # Extract location
-            location_elem = soup.find('span', class_='topcard__flavor--bullet') or soup.find('span', {'data-test': 'job-location'})
-            location = location_elem.get_text(strip=True) if location_elem else "Remote"
+            location_elem = tree.css_first('span.topcard__flavor--bullet') or tree.css_first('span[data-test="job-location"]')
+            location = location_elem.text(strip=True) if location_elem else "Remote"
             
             # Extract requirements/skills from job description
-            description_elem = soup.find('div', class_='show-more-less-html__markup') or soup.find('div', class_='description__text')
-            description = description_elem.get_text() if description_elem else ""
+            description_elem = tree.css_first('div.show-more-less-html__markup') or tree.css_first('div.description__text')
+            description = description_elem.text() if description_elem else ""
             
             requirements = self._extract_skills(description)
             
@@ -144,73 +318,13 @@ class LinkedInScraper(BaseJobScraper):
                 description=description
             )
         
-        except Exception as e:
-            print(f"Error parsing HTML job: {e}")
+        except Exception:
+            logger.exception("Error parsing HTML job")
             return None
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extract technical skills from job description using enhanced pattern matching."""
-        # Comprehensive list of technical skills
-        technical_skills = [
-            # Programming Languages
-            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby', 'Swift', 'Kotlin',
-            
-            # Python Frameworks
-            'Django', 'Flask', 'FastAPI', 'Tornado', 'Pyramid', 'Bottle',
-            
-            # JavaScript Frameworks/Libraries  
-            'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Next.js', 'Nuxt.js',
-            
-            # Cloud Platforms
-            'AWS', 'Azure', 'GCP', 'Google Cloud', 'DigitalOcean', 'Heroku',
-            
-            # Databases
-            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'SQLite', 'DynamoDB', 'Cassandra',
-            
-            # DevOps & Tools
-            'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible',
-            
-            # Version Control
-            'Git', 'GitHub', 'GitLab', 'Bitbucket',
-            
-            # APIs & Architecture
-            'REST API', 'GraphQL', 'Microservices', 'gRPC', 'WebSocket',
-            
-            # Testing
-            'pytest', 'Jest', 'Selenium', 'Cypress', 'Unit Testing', 'Integration Testing',
-            
-            # Machine Learning
-            'Machine Learning', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter',
-            
-            # Other Technologies
-            'Linux', 'Unix', 'Nginx', 'Apache', 'RabbitMQ', 'Kafka', 'CI/CD'
-        ]
-        
-        found_skills = set()
-        text_lower = text.lower()
-        
-        # Direct matching
-        for skill in technical_skills:
-            if skill.lower() in text_lower:
-                found_skills.add(skill)
-        
-        # Pattern-based matching for variations
-        patterns = {
-            'CI/CD': r'\b(ci/cd|continuous integration|continuous deployment|continuous delivery)\b',
-            'REST API': r'\b(rest|restful|api)\b',
-            'Machine Learning': r'\b(ml|machine learning|artificial intelligence|ai)\b',
-            'Docker': r'\b(docker|containerization|containers)\b',
-            'Kubernetes': r'\b(kubernetes|k8s|orchestration)\b',
-            'AWS': r'\b(aws|amazon web services)\b',
-            'Azure': r'\b(azure|microsoft azure)\b',
-            'GCP': r'\b(gcp|google cloud|google cloud platform)\b'
-        }
-        
-        for skill, pattern in patterns.items():
-            if re.search(pattern, text_lower):
-                found_skills.add(skill)
-        
-        return list(found_skills)[:12]  # Limit to top 12 skills
+        return list(_extract_skills_cached(text))
     
     def normalize_job_data(self, raw_data: dict) -> Job:
         """Normalize raw job data to Job model."""
@@ -295,6 +409,12 @@ class LinkedInScraper(BaseJobScraper):
             }
         ]
         
-        for sample in samples:
-            async with aiofiles.open(self.samples_path / sample["filename"], 'w', encoding='utf-8') as f:
-                await f.write(sample["content"])
\ No newline at end of file
+        await asyncio.gather(*(
+            self._write_sample(self.samples_path / sample["filename"], sample["content"])
+            for sample in samples
+        ))
+    
+    async def _write_sample(self, path: Path, content: str):
+        """Write a single sample HTML file."""
+        async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+            await f.write(content)
\ No newline at end of file
@@ -1,57 +1,170 @@
 import asyncio
+import hashlib
+import logging
 import os
-from typing import List, Dict, Any
+import threading
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 import numpy as np
 from pathlib import Path
-import PyPDF2
-import io
-from openai import OpenAI
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
+from openai import AsyncOpenAI
 from langchain_community.vectorstores import FAISS
+import faiss
 from langchain.chains import RetrievalQA
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from src.models.cv import CV, CVAnalysisResult
 from src.models.job import Job
+from src.services.embeddings import EMBEDDING_MODEL, create_embeddings, embeddings_backend
+from src.services.llm_client import chat_completion
+from src.utils.chunking import split_text
+from src.utils.pdf_text import create_pdf_executor, extract_text
+from src.utils.skill_matcher import SkillMatcher
+from cachetools import LRUCache
+import diskcache
 import re
 
+logger = logging.getLogger(__name__)
+
+# Technical skills recognized directly in CV text
+CV_TECHNICAL_SKILLS = (
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
+    'Django', 'Flask', 'FastAPI', 'React', 'Vue', 'Angular', 'Node.js', 'Express',
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
+    'Git', 'CI/CD', 'Jenkins', 'Linux', 'REST API', 'GraphQL', 'Machine Learning', 
+    'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'Scikit-learn', 'Microservices'
+)
+
+_CV_SKILL_MATCHER = SkillMatcher(CV_TECHNICAL_SKILLS)
+
+# Table matches at or above which the LLM skill extraction call is skipped
+LLM_SKILL_EXTRACTION_THRESHOLD = 8
+
+# Alternative spellings of skills (e.g. 'react' and 'react.js'), by canonical name
+RELATED_SKILLS = {
+    'react': ['react.js', 'reactjs'],
+    'node': ['node.js', 'nodejs'],
+    'vue': ['vue.js', 'vuejs'],
+    'angular': ['angularjs'],
+    'javascript': ['js'],
+    'typescript': ['ts'],
+    'python': ['py'],
+    'postgresql': ['postgres'],
+    'mongodb': ['mongo'],
+    'ci/cd': ['continuous integration', 'continuous deployment'],
+    'aws': ['amazon web services'],
+    'gcp': ['google cloud platform', 'google cloud'],
+    'azure': ['microsoft azure']
+}
+
+# Lowercase skill name -> canonical name, so relatedness is a dict lookup
+_CANON = {
+    name: main
+    for main, variations in RELATED_SKILLS.items()
+    for name in (main, *variations)
+}
+
+# Extracted text, skills and chunk embeddings of uploaded PDFs, keyed by SHA-256
+# plus the embedding and chunking setup that produced them
+CV_CACHE_DIR = os.getenv("CV_CACHE_DIR", "./.cv_cache")
+
+# Character windows CVs are split into before embedding
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# Embedding-similarity matching of requirements is opt-in since it loads the
+# embedding model on scoring calls
+SEMANTIC_SKILL_MATCHING = os.getenv("SEMANTIC_SKILL_MATCHING", "").lower() in ("1", "true", "yes")
+
+# Cosine similarity above which a (multi-word) requirement counts as covered by
+# a CV skill; MiniLM scores short near-homonyms such as Java/JavaScript highly
+SKILL_SIMILARITY_THRESHOLD = 0.85
+
+# Tenant stores move from exact (flat) search to IVF+PQ past this many chunks
+IVF_MIGRATION_THRESHOLD = 10000
+IVF_INDEX_FACTORY = "IVF1024,PQ32"
+IVF_TRAINING_SAMPLE = 65536
+IVF_NPROBE = 16
+
 class CVAnalyzer:
     """CV analysis service with RAG capabilities using HuggingFace model."""
     
     def __init__(self):
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
-        
         # Initialize HuggingFace OpenAI client
         hf_token = os.getenv("HF_TOKEN")
         if not hf_token:
             raise ValueError("HF_TOKEN environment variable is required")
             
-        self.hf_client = OpenAI(
+        self.hf_client = AsyncOpenAI(
             base_url="https://router.huggingface.co/v1",
             api_key=hf_token,
+            # Retries are handled by chat_completion with jittered backoff
+            max_retries=0,
         )
+        self._hf_token = hf_token
+        self._embeddings = None
+        self._embeddings_lock = threading.Lock()
         
-        # Initialize LangChain with HuggingFace client
-        self.llm = ChatOpenAI(
+        # One shared vector store per tenant; chunks carry their CV id as metadata
+        self.tenant_stores: Dict[str, FAISS] = {}
+        # (tenant, CV id) -> index positions of that CV's chunks in the tenant
+        # store, so retrieval searches only the CV's own chunks
+        self._cv_chunks: Dict[Tuple[str, str], np.ndarray] = {}
+        self.semantic_matching = SEMANTIC_SKILL_MATCHING
+        self._store_lock = asyncio.Lock()
+        # Normalized embeddings of skill/requirement names, keyed by lowercase name
+        self._skill_vector_cache: LRUCache = LRUCache(maxsize=10000)
+        self.cv_cache = diskcache.Cache(CV_CACHE_DIR)
+        # Page extraction for long PDFs is spread over worker processes
+        self._pdf_executor = create_pdf_executor()
+        self._migrating_tenants: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+    
+    # The embedding model and LangChain LLM are built on first use so
+    # workers that never index or retrieve CVs don't load the model weights.
+    # Use the model from worker threads (asyncio.to_thread) so the first,
+    # loading call never blocks the event loop
+    @property
+    def embeddings(self):
+        """Embedding model used for CV chunks and skill similarity."""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = create_embeddings()
+        return self._embeddings
+    
+    @embeddings.setter
+    def embeddings(self, embeddings):
+        self._embeddings = embeddings
+    
+    @cached_property
+    def llm(self) -> ChatOpenAI:
+        """LangChain chat model on the HuggingFace router."""
+        return ChatOpenAI(
             openai_api_base="https://router.huggingface.co/v1",
-            openai_api_key=hf_token,
+            openai_api_key=self._hf_token,
             model_name="deepseek-ai/DeepSeek-R1:novita",
             temperature=0.1
         )
-        
-        self.vector_stores: Dict[str, FAISS] = {}
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
-        )
+    
+    async def close(self):
+        """Close the HTTP client and shut down the PDF workers."""
+        await self.hf_client.close()
+        await asyncio.to_thread(self._pdf_executor.shutdown, cancel_futures=True)
     
     async def process_cv(self, cv_content: str, cv_id: str, tenant_id: str = None) -> CV:
         """Process CV content and extract information."""
-        # Extract skills from CV
-        skills = await self._extract_skills_from_cv(cv_content)
+        cv, _ = await self._process_cv(cv_content, cv_id, tenant_id)
+        return cv
+    
+    async def _process_cv(self, cv_content: str, cv_id: str, tenant_id: str = None):
+        """Process CV content; also returns the stored (chunk, vector) pairs, or None if storing failed."""
+        # Skill extraction waits on the LLM while chunk embedding is local
+        # compute, so run them concurrently
+        skills, text_embeddings = await asyncio.gather(
+            self._extract_skills_from_cv(cv_content),
+            self._embed_cv_chunks(cv_content)
+        )
         
         # Create CV object
         cv = CV(
@@ -62,194 +175,349 @@ class CVAnalyzer:
         )
         
         # Store in vector database
-        await self._store_cv_in_vector_db(cv)
+        if text_embeddings is not None:
+            text_embeddings = await self._store_cv_in_vector_db(cv, text_embeddings)
         
-        return cv
+        return cv, text_embeddings
     
     async def process_pdf_cv(self, pdf_content: bytes, cv_id: str, tenant_id: str = None) -> CV:
         """Process PDF CV and extract text content."""
-        text_content = self._extract_text_from_pdf(pdf_content)
-        return await self.process_cv(text_content, cv_id, tenant_id)
+        digest = hashlib.sha256(pdf_content).hexdigest()
+        return await self._process_pdf_cv_cached(digest, pdf_content, cv_id, tenant_id)
+    
+    async def process_pdf_cv_path(self, pdf_path: Union[str, Path], cv_id: str, tenant_id: str = None) -> CV:
+        """Process a PDF CV stored on disk without loading the whole file into memory."""
+        digest = await asyncio.to_thread(self._hash_file, pdf_path)
+        return await self._process_pdf_cv_cached(digest, pdf_path, cv_id, tenant_id)
+    
+    @staticmethod
+    def _hash_file(path: Union[str, Path]) -> str:
+        """SHA-256 of a file, read in chunks."""
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    
+    async def _process_pdf_cv_cached(
+        self, digest: str, pdf_source: Union[bytes, str, Path], cv_id: str, tenant_id: str = None
+    ) -> CV:
+        """Process a PDF CV, reusing extraction and embedding results for identical files."""
+        cache_key = self._cv_cache_key(digest)
+        cached = await asyncio.to_thread(self.cv_cache.get, cache_key)
+        if cached is not None:
+            cv = CV(id=cv_id, content=cached["text"], skills=cached["skills"], tenant_id=tenant_id)
+            # Re-index the cached vectors under the new CV id without re-embedding
+            await self._store_cv_in_vector_db(cv, list(zip(cached["chunks"], cached["vectors"])))
+            return cv
+        
+        text_content = await asyncio.to_thread(self._extract_text_from_pdf, pdf_source)
+        cv, text_embeddings = await self._process_cv(text_content, cv_id, tenant_id)
+        
+        if text_embeddings:
+            chunks, vectors = zip(*text_embeddings)
+            entry = {
+                "text": cv.content,
+                "skills": cv.skills,
+                "chunks": list(chunks),
+                "vectors": np.asarray(vectors, dtype=np.float32)
+            }
+            await asyncio.to_thread(self.cv_cache.set, cache_key, entry)
+        
+        return cv
+    
+    @staticmethod
+    def _cv_cache_key(digest: str) -> str:
+        """Cache key for a PDF, so a change of embedding model or chunking misses old vectors."""
+        return f"{digest}:{embeddings_backend()}:{EMBEDDING_MODEL}:{CHUNK_SIZE}:{CHUNK_OVERLAP}"
     
-    def _extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text from PDF bytes."""
+    def _extract_text_from_pdf(self, pdf_source: Union[bytes, str, Path]) -> str:
+        """Extract text from PDF bytes or a PDF file path."""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            return extract_text(pdf_source, self._pdf_executor)
         except Exception as e:
             raise ValueError(f"Error extracting text from PDF: {e}")
     
     async def _extract_skills_from_cv(self, cv_content: str) -> List[str]:
         """Extract skills from CV content using pattern matching and HuggingFace LLM."""
-        # Technical skills pattern matching
-        technical_skills = [
-            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
-            'Django', 'Flask', 'FastAPI', 'React', 'Vue', 'Angular', 'Node.js', 'Express',
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
-            'Git', 'CI/CD', 'Jenkins', 'Linux', 'REST API', 'GraphQL', 'Machine Learning', 
-            'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'Scikit-learn', 'Microservices'
-        ]
-        
-        found_skills = []
-        cv_lower = cv_content.lower()
-        
-        for skill in technical_skills:
-            if skill.lower() in cv_lower:
-                found_skills.append(skill)
-        
-        # Use HuggingFace LLM for additional skill extraction
+        # Technical skills pattern matching in a single pass, kept in table order
+        matched = _CV_SKILL_MATCHER.find(cv_content)
+        found_skills = [skill for skill in CV_TECHNICAL_SKILLS if skill in matched]
+        
+        # Use HuggingFace LLM for additional skill extraction, unless the table
+        # match already found enough skills to describe the CV
+        if len(found_skills) < LLM_SKILL_EXTRACTION_THRESHOLD:
+            try:
+                prompt = f"""
+                Extract technical skills from this CV content. Return only the skills as a comma-separated list.
+                Focus on programming languages, frameworks, tools, and technologies.
+                
+                CV Content:
+                {cv_content[:2000]}
+                
+                Skills:
+                """
+                
+                response = await chat_completion(
+                    self.hf_client,
+                    model="deepseek-ai/DeepSeek-R1:novita",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=200,
+                    temperature=0.1
+                )
+                
+                llm_response = response.choices[0].message.content
+                if llm_response:
+                    llm_skills = [skill.strip() for skill in llm_response.split(',')]
+                    # Filter and validate skills
+                    valid_skills = [skill for skill in llm_skills if skill and len(skill) > 2 and len(skill) < 30]
+                    found_skills.extend(valid_skills)
+            
+            except Exception:
+                logger.warning("HuggingFace skill extraction failed", exc_info=True)
+        
+        # Remove case-insensitive duplicates, keeping the first spelling and the
+        # table-then-LLM order
+        unique_skills = {}
+        for skill in found_skills:
+            unique_skills.setdefault(skill.strip().lower(), skill.strip())
+        return list(unique_skills.values())[:15]  # Limit to top 15 skills
+    
+    async def _embed_cv_chunks(self, cv_content: str) -> Optional[List[Tuple[str, Any]]]:
+        """Split CV content into chunks and embed them; returns (chunk, vector) pairs, or None on failure."""
         try:
-            prompt = f"""
-            Extract technical skills from this CV content. Return only the skills as a comma-separated list.
-            Focus on programming languages, frameworks, tools, and technologies.
+            # Split text into chunks
+            texts = split_text(cv_content, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
             
-            CV Content:
-            {cv_content[:2000]}
+            # Embed outside the store lock; indexing the vectors is cheap
+            vectors = await asyncio.to_thread(lambda: self.embeddings.embed_documents(texts))
+            return list(zip(texts, vectors))
+        
+        except Exception:
+            logger.warning("Error embedding CV chunks", exc_info=True)
+            return None
+    
+    async def _store_cv_in_vector_db(self, cv: CV, text_embeddings: List[Tuple[str, Any]]):
+        """Store embedded CV chunks in the tenant's vector database for RAG; returns the pairs, or None on failure."""
+        try:
+            metadatas = [{"cv_id": cv.id} for _ in text_embeddings]
             
-            Skills:
-            """
+            # Tenant key keeps stores isolated for multi-tenancy
+            tenant_key = cv.tenant_id or 'default'
             
-            response = await asyncio.to_thread(
-                self.hf_client.chat.completions.create,
-                model="deepseek-ai/DeepSeek-R1:novita",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200,
-                temperature=0.1
-            )
+            async with self._store_lock:
+                store = self.tenant_stores.get(tenant_key)
+                start = store.index.ntotal if store is not None else 0
+                if store is not None:
+                    # Add to the tenant's existing store
+                    store.add_embeddings(text_embeddings, metadatas=metadatas)
+                else:
+                    # First CV for this tenant creates the store; off the loop,
+                    # since a cached CV may be the first use of the model
+                    self.tenant_stores[tenant_key] = await asyncio.to_thread(
+                        lambda: FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas)
+                    )
+                # New vectors are appended, so the CV's chunks take the next positions
+                self._cv_chunks[(tenant_key, cv.id)] = np.arange(start, start + len(text_embeddings), dtype=np.int64)
+                self._schedule_index_migration(tenant_key)
             
-            llm_response = response.choices[0].message.content
-            if llm_response:
-                llm_skills = [skill.strip() for skill in llm_response.split(',')]
-                # Filter and validate skills
-                valid_skills = [skill for skill in llm_skills if skill and len(skill) > 2 and len(skill) < 30]
-                found_skills.extend(valid_skills)
+            return text_embeddings
         
-        except Exception as e:
-            print(f"HuggingFace skill extraction failed: {e}")
+        except Exception:
+            logger.warning("Error storing CV in vector DB", exc_info=True)
+            return None
+    
+    def _schedule_index_migration(self, tenant_key: str):
+        """Start moving a tenant store to IVF+PQ once its flat index grows past the threshold."""
+        index = self.tenant_stores[tenant_key].index
+        if (tenant_key in self._migrating_tenants or
+                not isinstance(index, faiss.IndexFlat) or
+                index.ntotal <= IVF_MIGRATION_THRESHOLD):
+            return
         
-        # Remove duplicates and return
-        unique_skills = list(set(found_skills))
-        return unique_skills[:15]  # Limit to top 15 skills
+        self._migrating_tenants.add(tenant_key)
+        task = asyncio.create_task(self._migrate_store_to_ivfpq(tenant_key))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
     
-    async def _store_cv_in_vector_db(self, cv: CV):
-        """Store CV in vector database for RAG."""
+    async def _migrate_store_to_ivfpq(self, tenant_key: str):
+        """Replace a tenant's flat index with a trained IVF+PQ index.
+        
+        Vectors are copied under the store lock, the slow training runs in a
+        thread without the lock, and vectors added meanwhile are appended
+        before the swap. Index positions are preserved, so the docstore
+        mapping and the per-CV positions used by retrieval stay valid.
+        """
         try:
-            # Split text into chunks
-            texts = self.text_splitter.split_text(cv.content)
+            store = self.tenant_stores[tenant_key]
+            async with self._store_lock:
+                vectors = store.index.reconstruct_n(0, store.index.ntotal)
             
-            # Create vector store key (include tenant for multi-tenancy)
-            store_key = f"{cv.tenant_id or 'default'}_{cv.id}"
+            index = await asyncio.to_thread(self._build_ivfpq_index, vectors, store.index.metric_type)
             
-            # Create or update vector store
-            if store_key in self.vector_stores:
-                # Add to existing store
-                self.vector_stores[store_key].add_texts(texts)
-            else:
-                # Create new vector store
-                self.vector_stores[store_key] = await asyncio.to_thread(
-                    FAISS.from_texts, texts, self.embeddings
-                )
+            async with self._store_lock:
+                flat = store.index
+                if flat.ntotal > index.ntotal:
+                    index.add(flat.reconstruct_n(index.ntotal, flat.ntotal - index.ntotal))
+                store.index = index
         
-        except Exception as e:
-            print(f"Error storing CV in vector DB: {e}")
+        except Exception:
+            logger.warning("Error migrating vector store for tenant %s", tenant_key, exc_info=True)
+        
+        finally:
+            self._migrating_tenants.discard(tenant_key)
+    
+    @staticmethod
+    def _build_ivfpq_index(vectors: np.ndarray, metric_type: int):
+        """Train an IVF+PQ index on (a sample of) the vectors and add them all."""
+        index = faiss.index_factory(vectors.shape[1], IVF_INDEX_FACTORY, metric_type)
+        
+        sample = vectors
+        if len(vectors) > IVF_TRAINING_SAMPLE:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(len(vectors), IVF_TRAINING_SAMPLE, replace=False)]
+        index.train(sample)
+        index.add(vectors)
+        
+        faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+        return index
     
     async def analyze_cv_job_match(self, cv: CV, job: Job) -> CVAnalysisResult:
         """Analyze how well a CV matches a job posting."""
-        # Calculate fit score
-        fit_score = self._calculate_fit_score(cv.skills, job.requirements)
+        analysis = await self.score_cv_job_match(cv, job)
         
-        # Find matched and missing requirements
-        matched_requirements = []
-        for req in job.requirements:
-            for skill in cv.skills:
-                if req.lower() == skill.lower() or req.lower() in skill.lower() or skill.lower() in req.lower():
-                    matched_requirements.append(req)
-                    break
+        # Generate summary using RAG
+        summary = await self.generate_match_summary(cv, job, analysis.fit_score)
         
-        missing_requirements = [req for req in job.requirements if req not in matched_requirements]
+        return analysis.model_copy(update={"summary": summary})
+    
+    async def score_cv_job_match(self, cv: CV, job: Job) -> CVAnalysisResult:
+        """Score a CV against a job posting without the LLM-generated summary."""
+        # Find matched and missing requirements
+        matched = await self._match_requirements(cv.skills, job.requirements)
+        matched_requirements = [req for req in job.requirements if req in matched]
+        missing_requirements = [req for req in job.requirements if req not in matched]
         
-        # Generate summary using RAG
-        summary = await self._generate_match_summary(cv, job, fit_score)
+        # Calculate fit score
+        fit_score = self._calculate_fit_score(len(matched_requirements), len(job.requirements), len(cv.skills))
         
         return CVAnalysisResult(
             cv_id=cv.id,
             extracted_skills=cv.skills,
             fit_score=fit_score,
-            summary=summary,
+            summary=f"Candidate shows {fit_score}% compatibility with the position requirements based on skill analysis.",
             matched_requirements=matched_requirements,
             missing_requirements=missing_requirements
         )
     
-    def _calculate_fit_score(self, cv_skills: List[str], job_requirements: List[str]) -> int:
-        """Calculate job fit score based on skill matching with fuzzy matching."""
-        if not job_requirements:
-            return 50  # Default score if no requirements
+    async def _match_requirements(self, cv_skills: List[str], job_requirements: List[str]) -> Set[str]:
+        """Return the requirements covered by the CV skills.
         
-        cv_skills_lower = [skill.lower() for skill in cv_skills]
-        matched_count = 0
+        Cheap lexical checks (direct, partial or related match) run first. With
+        semantic matching enabled, remaining multi-word requirements are then
+        compared against the skills by embedding cosine similarity in a single
+        matrix product; single-word names are left to the lexical checks.
+        """
+        # Lowercase once; with ~5-15 short names a plain substring scan beats
+        # building matcher automata per call
+        cv_skills_lower = frozenset(skill.lower() for skill in cv_skills if skill)
+        cv_skill_canons = {_CANON[cv_skill] for cv_skill in cv_skills_lower if cv_skill in _CANON}
+        matched = set()
         
         for req in job_requirements:
             req_lower = req.lower()
-            # Direct match or partial match
-            for cv_skill in cv_skills_lower:
-                if (req_lower == cv_skill or 
-                    req_lower in cv_skill or 
-                    cv_skill in req_lower or
-                    self._skills_are_related(req_lower, cv_skill)):
-                    matched_count += 1
-                    break
+            # Direct, partial or related match
+            if (_CANON.get(req_lower) in cv_skill_canons or
+                    any(req_lower in cv_skill or cv_skill in req_lower for cv_skill in cv_skills_lower)):
+                matched.add(req)
+        
+        unmatched = [req for req in job_requirements if req not in matched and len(req.split()) > 1]
+        if self.semantic_matching and unmatched and cv_skills:
+            try:
+                req_vecs, skill_vecs = await self._skill_vectors(unmatched, cv_skills)
+                sims = req_vecs @ skill_vecs.T
+                matched.update(req for req, ok in zip(unmatched, sims.max(axis=1) > SKILL_SIMILARITY_THRESHOLD) if ok)
+            except Exception:
+                logger.warning("Semantic skill matching failed", exc_info=True)
+        
+        return matched
+    
+    async def _skill_vectors(self, requirements: List[str], cv_skills: List[str]):
+        """Unit-normalized embedding matrices for requirements and CV skills."""
+        keys = list(dict.fromkeys(name.lower() for name in [*requirements, *cv_skills]))
+        vectors = {key: self._skill_vector_cache.get(key) for key in keys}
+        
+        # Only embed names not seen before; skill vocabularies repeat heavily across CVs and jobs
+        missing = [key for key, vector in vectors.items() if vector is None]
+        if missing:
+            embedded = np.asarray(
+                await asyncio.to_thread(lambda: self.embeddings.embed_documents(missing)), dtype=np.float32
+            )
+            embedded /= np.clip(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12, None)
+            for key, vector in zip(missing, embedded):
+                vectors[key] = self._skill_vector_cache[key] = vector
         
-        fit_percentage = (matched_count / len(job_requirements)) * 100
+        req_vecs = np.stack([vectors[req.lower()] for req in requirements])
+        skill_vecs = np.stack([vectors[skill.lower()] for skill in cv_skills])
+        return req_vecs, skill_vecs
+    
+    def _calculate_fit_score(self, matched_count: int, requirement_count: int, skill_count: int) -> int:
+        """Calculate job fit score from the number of matched requirements."""
+        if not requirement_count:
+            return 50  # Default score if no requirements
+        
+        fit_percentage = (matched_count / requirement_count) * 100
         
         # Add bonus for extra relevant skills (up to 10 points)
-        extra_skills_bonus = min(len(cv_skills) - matched_count, 5) * 2
+        extra_skills_bonus = min(skill_count - matched_count, 5) * 2
         
         return min(int(fit_percentage + extra_skills_bonus), 100)
     
-    def _skills_are_related(self, skill1: str, skill2: str) -> bool:
-        """Check if two skills are related (e.g., 'react' and 'react.js')."""
-        related_skills = {
-            'react': ['react.js', 'reactjs'],
-            'node': ['node.js', 'nodejs'],
-            'vue': ['vue.js', 'vuejs'],
-            'angular': ['angularjs'],
-            'javascript': ['js'],
-            'typescript': ['ts'],
-            'python': ['py'],
-            'postgresql': ['postgres'],
-            'mongodb': ['mongo'],
-            'ci/cd': ['continuous integration', 'continuous deployment'],
-            'aws': ['amazon web services'],
-            'gcp': ['google cloud platform', 'google cloud'],
-            'azure': ['microsoft azure']
-        }
-        
-        for main_skill, variations in related_skills.items():
-            if ((main_skill in skill1 and any(var in skill2 for var in variations)) or
-                (main_skill in skill2 and any(var in skill1 for var in variations))):
-                return True
-        
-        return False
-    
-    async def _generate_match_summary(self, cv: CV, job: Job, fit_score: int) -> str:
-        """Generate match summary using RAG with HuggingFace model."""
+    async def retrieve_cv_context(self, cv: CV, job: Job, k: int = 3) -> Optional[str]:
+        """Retrieve the CV chunks most relevant to the job, or None if the CV isn't indexed."""
         try:
-            store_key = f"{cv.tenant_id or 'default'}_{cv.id}"
-            if store_key not in self.vector_stores:
-                return f"Candidate shows {fit_score}% compatibility with the position requirements based on skill analysis."
+            tenant_key = cv.tenant_id or 'default'
+            positions = self._cv_chunks.get((tenant_key, cv.id))
+            if positions is None or not len(positions):
+                return None
             
-            # Create context from CV using vector search
-            retriever = self.vector_stores[store_key].as_retriever(search_kwargs={"k": 3})
-            relevant_docs = await asyncio.to_thread(
-                retriever.get_relevant_documents, 
-                f"skills experience {job.title}"
-            )
+            query_text = f"skills experience {job.title}"
+            query = await asyncio.to_thread(lambda: self.embeddings.embed_query(query_text))
             
-            context = " ".join([doc.page_content for doc in relevant_docs])[:1500]
+            # Search the tenant index restricted to this CV's positions;
+            # filtering the tenant-wide top hits can miss them in large tenants
+            store = self.tenant_stores[tenant_key]
+            selector = faiss.IDSelectorBatch(positions)
+            _, labels = store.index.search(
+                np.asarray([query], dtype=np.float32),
+                min(k, len(positions)),
+                params=self._search_params(store.index, selector)
+            )
             
+            relevant_docs = [
+                store.docstore.search(store.index_to_docstore_id[int(label)])
+                for label in labels[0] if label >= 0
+            ]
+            return " ".join([doc.page_content for doc in relevant_docs])[:1500]
+        
+        except Exception:
+            logger.warning("Error retrieving CV context", exc_info=True)
+            return None
+    
+    @staticmethod
+    def _search_params(index, selector) -> faiss.SearchParameters:
+        """Search parameters restricting a (flat or IVF) index to the selected ids."""
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is None:
+            return faiss.SearchParameters(sel=selector)
+        # A CV's chunks can sit in any inverted list, so probe them all; the
+        # selector skips every other entry before computing its distance
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nlist)
+    
+    async def generate_match_summary(self, cv: CV, job: Job, fit_score: int) -> str:
+        """Generate match summary using RAG with HuggingFace model."""
+        context = await self.retrieve_cv_context(cv, job)
+        if context is None:
+            return f"Candidate shows {fit_score}% compatibility with the position requirements based on skill analysis."
+        
+        try:
             prompt = f"""
             Analyze this candidate's fit for a {job.title} position at {job.company}.
             
@@ -260,8 +528,8 @@ class CVAnalyzer:
             Provide a brief professional summary (2-3 sentences) of the match quality, highlighting strengths and any gaps.
             """
             
-            response = await asyncio.to_thread(
-                self.hf_client.chat.completions.create,
+            response = await chat_completion(
+                self.hf_client,
                 model="deepseek-ai/DeepSeek-R1:novita",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=150,
@@ -271,6 +539,6 @@ class CVAnalyzer:
             summary = response.choices[0].message.content.strip()
             return summary if summary else f"Candidate demonstrates {fit_score}% alignment with the position requirements."
         
-        except Exception as e:
-            print(f"Error generating match summary: {e}")
+        except Exception:
+            logger.warning("Error generating match summary", exc_info=True)
             return f"Candidate shows {fit_score}% compatibility with the position requirements."
@@ -0,0 +1,121 @@
+import logging
+import os
+from pathlib import Path
+from typing import List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Intra-op threads for embedding inference; small encoder models stop scaling
+# past a handful of cores, and each server worker runs its own model
+EMBEDDINGS_THREADS = int(os.getenv("EMBEDDINGS_THREADS", min(8, os.cpu_count() or 1)))
+
+class ONNXMiniLMEmbeddings(Embeddings):
+    """MiniLM sentence embeddings from an int8-quantized ONNX export, for CPU inference."""
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        cache_dir: str = "./onnx_models",
+        batch_size: int = 64,
+        max_length: int = 256
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = Path(cache_dir) / model_name.replace("/", "__")
+        model_path = model_dir / "model_quantized.onnx"
+        if not model_path.exists():
+            self._export_quantized(model_name, model_dir)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = EMBEDDINGS_THREADS
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    @staticmethod
+    def _export_quantized(model_name: str, model_dir: Path):
+        """Export the model to ONNX and apply dynamic int8 quantization (one-off)."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        logger.info("Exporting %s to quantized ONNX in %s", model_name, model_dir)
+        model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        quantizer = ORTQuantizer.from_pretrained(model)
+        quantizer.quantize(
+            save_dir=model_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        )
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Mean-pool and L2-normalize token embeddings, matching sentence-transformers."""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            inputs = {name: array for name, array in encoded.items() if name in self._input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.tolist())
+
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        return self._embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._embed([text])[0]
+
+def _configure_torch_threads():
+    """Pin PyTorch CPU threading before the model runs."""
+    import torch
+    
+    torch.set_num_threads(EMBEDDINGS_THREADS)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable once per process, before any inter-op work has started
+        pass
+
+def embeddings_backend() -> str:
+    """Embedding backend selected by EMBEDDINGS_BACKEND: "torch" (default) or "onnx"."""
+    return os.getenv("EMBEDDINGS_BACKEND", "torch").lower()
+
+def create_embeddings() -> Embeddings:
+    """Create the embedding model selected by EMBEDDINGS_BACKEND ("torch" or "onnx")."""
+    if embeddings_backend() == "onnx":
+        try:
+            return ONNXMiniLMEmbeddings()
+        except ImportError as e:
+            logger.warning("ONNX embeddings unavailable, falling back to PyTorch: %s", e)
+
+    _configure_torch_threads()
+    return HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL,
+        # sentence-transformers length-sorts inputs within encode, so fixed
+        # mini-batches only pad to the longest chunk in each batch
+        encode_kwargs={"batch_size": 64}
+    )
@@ -1,7 +1,7 @@
-import asyncio
+import logging
 import os
-from typing import List
-from openai import OpenAI
+from typing import List, Optional, Tuple
+from openai import AsyncOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.schema import BaseOutputParser
 import json
@@ -9,6 +9,16 @@ import re
 from src.models.cv import CV, CVAnalysisResult
 from src.models.job import Job
 from src.models.interview import InterviewAssessment, InterviewQuestion
+from src.services.llm_client import chat_completion
+
+logger = logging.getLogger(__name__)
+
+# Patterns used by InterviewQuestionParser, compiled once; the JSON match is
+# non-greedy to avoid backtracking across long completions
+_JSON_RE = re.compile(r'\{.*?\}', re.DOTALL)
+_BULLET_RE = re.compile(r'^[-•]\s*')
+_NUM_RE = re.compile(r'^\d+\.\s*')
+_Q_RE = re.compile(r'^(Question\s*\d*:?\s*)', re.IGNORECASE)
 
 class InterviewQuestionParser(BaseOutputParser):
     """Parser for interview questions from LLM output."""
@@ -19,7 +29,7 @@ class InterviewQuestionParser(BaseOutputParser):
         
         # Try to extract JSON first
         try:
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
+            json_match = _JSON_RE.search(text)
             if json_match:
                 data = json.loads(json_match.group())
                 if 'questions' in data:
@@ -35,9 +45,9 @@ class InterviewQuestionParser(BaseOutputParser):
                         line.startswith(('1.', '2.', '3.', '4.')) or
                         any(keyword in line.lower() for keyword in ['question', '?'])):
                 # Clean up the question
-                question = re.sub(r'^[-•]\s*', '', line)
-                question = re.sub(r'^\d+\.\s*', '', question)
-                question = re.sub(r'^(Question\s*\d*:?\s*)', '', question, flags=re.IGNORECASE)
+                question = _BULLET_RE.sub('', line)
+                question = _NUM_RE.sub('', question)
+                question = _Q_RE.sub('', question)
                 if question and len(question) > 10:
                     questions.append(question.strip())
         
@@ -51,13 +61,19 @@ class InterviewGenerator:
         if not hf_token:
             raise ValueError("HF_TOKEN environment variable is required")
             
-        self.hf_client = OpenAI(
+        self.hf_client = AsyncOpenAI(
             base_url="https://router.huggingface.co/v1",
             api_key=hf_token,
+            # Retries are handled by chat_completion with jittered backoff
+            max_retries=0,
         )
         
         self.parser = InterviewQuestionParser()
     
+    async def close(self):
+        """Close the HTTP client."""
+        await self.hf_client.close()
+    
     async def generate_interview_assessment(
         self, 
         cv_analysis: CVAnalysisResult, 
@@ -83,6 +99,48 @@ class InterviewGenerator:
             rejected=False
         )
     
+    async def generate_full(
+        self, 
+        cv_analysis: CVAnalysisResult, 
+        job: Job, 
+        cv_context: Optional[str] = None
+    ) -> Tuple[str, InterviewAssessment]:
+        """Generate the match summary and interview questions with a single completion.
+        
+        Returns the summary (empty if the model gave none) and the assessment;
+        rejected candidates should use generate_interview_assessment instead.
+        """
+        summary, questions = "", []
+        
+        try:
+            response = await chat_completion(
+                self.hf_client,
+                model="deepseek-ai/DeepSeek-R1:novita",
+                messages=[{"role": "user", "content": self._create_full_prompt(cv_analysis, job, cv_context)}],
+                max_tokens=1000,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            
+            content = response.choices[0].message.content or ""
+            # Tolerate text around the JSON object (e.g. reasoning output)
+            data = json.loads(content[content.find('{'):content.rfind('}') + 1])
+            summary = str(data.get("summary") or "").strip()
+            questions = [str(question).strip() for question in data.get("questions") or [] if str(question).strip()]
+        
+        except Exception:
+            logger.warning("Error generating summary and questions with HuggingFace", exc_info=True)
+        
+        # Ensure we have exactly 4 questions
+        if len(questions) < 4:
+            questions.extend(self._get_fallback_questions(job.title, cv_analysis.matched_requirements))
+        
+        return summary, InterviewAssessment(
+            fit_score=cv_analysis.fit_score,
+            questions=questions[:4],
+            rejected=False
+        )
+    
     def _generate_rejection_message(self, job: Job, fit_score: int) -> str:
         """Generate a polite rejection message."""
         return (
@@ -100,15 +158,7 @@ class InterviewGenerator:
             # Generate all questions in one comprehensive prompt
             prompt = self._create_comprehensive_prompt(cv_analysis, job)
             
-            response = await asyncio.to_thread(
-                self.hf_client.chat.completions.create,
-                model="deepseek-ai/DeepSeek-R1:novita",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.3
-            )
-            
-            questions_text = response.choices[0].message.content
+            questions_text = await self._stream_questions_text(prompt)
             questions = self.parser.parse(questions_text)
             
             # Ensure we have exactly 4 questions
@@ -118,10 +168,55 @@ class InterviewGenerator:
             
             return questions[:4]
         
-        except Exception as e:
-            print(f"Error generating questions with HuggingFace: {e}")
+        except Exception:
+            logger.warning("Error generating questions with HuggingFace", exc_info=True)
             return self._get_fallback_questions(job.title, cv_analysis.matched_requirements)
     
+    async def _stream_questions_text(self, prompt: str, question_count: int = 4) -> str:
+        """Stream the completion and stop once enough numbered lines are complete.
+        
+        Returns the answer text, without any leading <think> reasoning block.
+        """
+        stream = await chat_completion(
+            self.hf_client,
+            model="deepseek-ai/DeepSeek-R1:novita",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=800,
+            temperature=0.3,
+            stream=True
+        )
+        
+        text = ""
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                text += delta
+                # A numbered line is complete once its newline has arrived
+                if "\n" in delta and self._count_numbered_lines(self._strip_reasoning(text)) >= question_count:
+                    break
+        
+        return self._strip_reasoning(text)
+    
+    @staticmethod
+    def _strip_reasoning(text: str) -> str:
+        """Text after a <think>...</think> block; empty while the block is still open."""
+        if "<think>" not in text:
+            return text
+        _, closed, answer = text.partition("</think>")
+        return answer if closed else ""
+    
+    @staticmethod
+    def _count_numbered_lines(text: str) -> int:
+        """Count distinct leading indices ("1.", "2.", ...) among complete lines."""
+        indices = set()
+        for line in text.split('\n')[:-1]:
+            line = line.strip()
+            if _NUM_RE.match(line):
+                indices.add(line.split('.', 1)[0])
+        return len(indices)
+    
     def _create_comprehensive_prompt(self, cv_analysis: CVAnalysisResult, job: Job) -> str:
         """Create a comprehensive prompt for generating all interview questions."""
         return f"""
@@ -150,6 +245,30 @@ class InterviewGenerator:
         Questions:
         """
     
+    def _create_full_prompt(self, cv_analysis: CVAnalysisResult, job: Job, cv_context: Optional[str]) -> str:
+        """Create a prompt asking for the match summary and all interview questions as JSON."""
+        return f"""
+        Assess a candidate for a {job.title} position at {job.company} and prepare their interview.
+
+        Candidate Profile:
+        - Matched Skills: {', '.join(cv_analysis.matched_requirements)}
+        - Missing Requirements: {', '.join(cv_analysis.missing_requirements)}
+        - All Extracted Skills: {', '.join(cv_analysis.extracted_skills)}
+        - Fit Score: {cv_analysis.fit_score}%
+        - CV Context: {cv_context or 'Not available'}
+
+        Job Requirements: {', '.join(job.requirements)}
+
+        Instructions:
+        1. Write a brief professional summary (2-3 sentences) of the match quality, highlighting strengths and any gaps
+        2. Generate exactly 3 technical questions focusing on the matched skills
+        3. Generate exactly 1 scenario-based question related to real work situations, starting with "Scenario:"
+        4. Make questions specific to the role and candidate's background and test practical knowledge
+
+        Respond with a JSON object only:
+        {{"summary": "...", "questions": ["...", "...", "...", "Scenario: ..."]}}
+        """
+    
     def _get_fallback_questions(self, job_title: str, matched_skills: List[str]) -> List[str]:
         """Get fallback questions if LLM generation fails."""
         
@@ -0,0 +1,13 @@
+from typing import Any
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+@retry(
+    retry=retry_if_exception_type((APIConnectionError, RateLimitError, InternalServerError)),
+    wait=wait_exponential_jitter(initial=0.5, max=8),
+    stop=stop_after_attempt(3),
+    reraise=True
+)
+async def chat_completion(client: AsyncOpenAI, **kwargs: Any) -> Any:
+    """Call ``chat.completions.create``, retrying transient failures with jittered backoff."""
+    return await client.chat.completions.create(**kwargs)
@@ -19,15 +19,24 @@ class MatchingService:
     ) -> dict:
         """Process complete CV-job assessment with interview questions."""
         
-        # Analyze CV-job match
-        cv_analysis = await self.cv_analyzer.analyze_cv_job_match(cv, job)
+        # Score the CV-job match (skill matching only, no LLM call)
+        cv_analysis = await self.cv_analyzer.score_cv_job_match(cv, job)
         
-        # Generate interview assessment
-        interview_assessment = await self.interview_generator.generate_interview_assessment(
-            cv_analysis, job
-        )
+        if cv_analysis.fit_score < 50:
+            # Rejections need no questions, only the summary
+            summary = await self.cv_analyzer.generate_match_summary(cv, job, cv_analysis.fit_score)
+            interview_assessment = await self.interview_generator.generate_interview_assessment(cv_analysis, job)
+        else:
+            # One completion produces both the summary and the questions
+            cv_context = await self.cv_analyzer.retrieve_cv_context(cv, job)
+            summary, interview_assessment = await self.interview_generator.generate_full(
+                cv_analysis, job, cv_context
+            )
+        
+        if summary:
+            cv_analysis = cv_analysis.model_copy(update={"summary": summary})
         
         return {
-            "cv_analysis": cv_analysis.dict(),
-            "interview_assessment": interview_assessment.dict()
+            "cv_analysis": cv_analysis.model_dump(),
+            "interview_assessment": interview_assessment.model_dump()
         }
\ No newline at end of file
@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+class RequestCoalescer:
+    """Coalesce identical concurrent requests into a single dispatch.
+
+    Requests are queued and drained in batches of up to ``max_batch_size``
+    items or ``max_wait`` seconds, whichever comes first; a request that finds
+    the queue otherwise empty is dispatched immediately. Requests in a batch
+    that share a key are dispatched once and all callers receive the shared
+    result; callers whose key is already being dispatched join that call.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[Any], Awaitable[Any]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.05
+    ):
+        self._dispatch = dispatch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, payload: Any) -> Any:
+        """Queue a request and wait for its (possibly shared) result."""
+        self._ensure_worker()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = self._loop.create_future()
+        await self._queue.put((key, payload, future))
+        return await future
+
+    async def close(self):
+        """Stop the worker and cancel in-flight dispatches and queued requests."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+
+        tasks = [task for task in (self._worker, *self._tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
+
+    def _ensure_worker(self):
+        """Start the batching worker on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._inflight = {}
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        """Drain the queue in batches and dispatch one call per unique key."""
+        while True:
+            batch = [await self._queue.get()]
+
+            # Only wait for more requests if others are already arriving
+            if not self._queue.empty():
+                deadline = self._loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            groups: Dict[Hashable, Tuple[Any, List[asyncio.Future]]] = {}
+            for key, payload, future in batch:
+                groups.setdefault(key, (payload, []))[1].append(future)
+
+            for key, (payload, futures) in groups.items():
+                # Register before the task starts so later callers join it
+                shared = self._loop.create_future()
+                self._inflight[key] = shared
+                task = self._loop.create_task(self._dispatch_group(key, payload, futures, shared))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch_group(
+        self,
+        key: Hashable,
+        payload: Any,
+        futures: List[asyncio.Future],
+        shared: asyncio.Future
+    ):
+        """Dispatch a single request and fan its result out to every waiter."""
+        try:
+            result = await self._dispatch(payload)
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            shared.set_result(result)
+        finally:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+            self._resolve(futures, shared)
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], shared: asyncio.Future):
+        """Copy the shared outcome (result, exception or cancellation) to each waiter."""
+        for future in futures:
+            if future.done():
+                continue
+            if shared.cancelled():
+                future.cancel()
+            elif shared.exception() is not None:
+                future.set_exception(shared.exception())
+            else:
+                future.set_result(shared.result())
+
+        # Avoid "exception was never retrieved" warnings when nobody joined
+        if not shared.cancelled():
+            shared.exception()
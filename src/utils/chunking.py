@@ -0,0 +1,44 @@
+from typing import List
+
+def _last_space(text: str, start: int, end: int) -> int:
+    """Index of the last space or newline in text[start:end], or -1."""
+    return max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+
+def _first_space(text: str, start: int, end: int) -> int:
+    """Index of the first space or newline in text[start:end], or -1."""
+    found = [index for index in (text.find(" ", start, end), text.find("\n", start, end)) if index >= 0]
+    return min(found) if found else -1
+
+def split_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
+    """Split text into overlapping windows of at most chunk_size characters.
+
+    Cuts are moved back to the last whitespace in the second half of a window
+    and overlapping windows start on a word boundary, so words are only split
+    when a single word spans half a window.
+    """
+    chunks = []
+    start = 0
+    length = len(text)
+
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            cut = _last_space(text, start + chunk_size // 2, end)
+            if cut > start:
+                end = cut
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+
+        # Step back by the overlap, then forward to the start of the next word
+        next_start = max(end - chunk_overlap, start + 1)
+        if not text[next_start - 1].isspace():
+            space = _first_space(text, next_start, end)
+            if space >= 0:
+                next_start = space + 1
+        start = next_start
+
+    return chunks
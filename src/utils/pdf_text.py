@@ -0,0 +1,57 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+import fitz
+
+PdfSource = Union[bytes, str, Path]
+
+# Documents with at least this many pages are split across worker processes
+PARALLEL_MIN_PAGES = 32
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+def open_pdf(source: PdfSource) -> fitz.Document:
+    """Open a PDF from bytes or a file path."""
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+def extract_page_range(source: PdfSource, start: int, stop: int) -> str:
+    """Extract the text of pages [start, stop) joined by newlines."""
+    with open_pdf(source) as doc:
+        return "\n".join(doc[number].get_text("text") for number in range(start, stop))
+
+def extract_text(source: PdfSource, executor: Optional[Executor] = None) -> str:
+    """Extract the text of every page, splitting large documents across the executor."""
+    with open_pdf(source) as doc:
+        page_count = doc.page_count
+        if executor is None or page_count < PARALLEL_MIN_PAGES:
+            return "\n".join(page.get_text("text") for page in doc)
+
+    # Hand workers a file path so the PDF bytes aren't pickled once per task
+    if isinstance(source, bytes):
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(source)
+        try:
+            return _extract_in_workers(tmp.name, page_count, executor)
+        finally:
+            os.unlink(tmp.name)
+    return _extract_in_workers(source, page_count, executor)
+
+def _extract_in_workers(path: Union[str, Path], page_count: int, executor: Executor) -> str:
+    """Split the pages of a PDF file into contiguous ranges extracted by the executor."""
+    step = -(-page_count // PDF_WORKERS)
+    starts = range(0, page_count, step)
+    stops = [min(start + step, page_count) for start in starts]
+    return "\n".join(executor.map(extract_page_range, [path] * len(starts), starts, stops))
+
+def create_pdf_executor() -> ProcessPoolExecutor:
+    """Process pool for page extraction.
+
+    PyMuPDF documents are not thread-safe, so pages are split across
+    processes rather than threads; spawned workers avoid forking a
+    multi-threaded server process.
+    """
+    return ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
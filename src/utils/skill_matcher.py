@@ -0,0 +1,44 @@
+from typing import Iterable, Set
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional
+    ahocorasick = None
+
+class SkillMatcher:
+    """Case-insensitive substring matcher for a fixed set of skill names.
+
+    Uses a single Aho-Corasick automaton when pyahocorasick is installed so a
+    text is scanned once regardless of the number of skills, and falls back to
+    one substring check per skill otherwise.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills = tuple(skills)
+        self._skills_lower = tuple((skill.lower(), skill) for skill in self.skills)
+        self._skills_bytes = tuple((key.encode(), skill) for key, skill in self._skills_lower)
+        self._automaton = None
+
+        if ahocorasick is not None and self.skills:
+            self._automaton = ahocorasick.Automaton()
+            for key, skill in self._skills_lower:
+                # Several canonical names may share a lowercase key
+                existing = self._automaton.get(key, ())
+                self._automaton.add_word(key, existing + (skill,))
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> Set[str]:
+        """Return the canonical names of all skills occurring in text."""
+        return self.find_lowercase(text.lower())
+
+    def find_lowercase(self, text_lower: str) -> Set[str]:
+        """Like find(), for callers that already hold the lowercased text."""
+        if self._automaton is not None:
+            found = set()
+            for _, names in self._automaton.iter(text_lower):
+                found.update(names)
+            return found
+
+        # Byte search stays on CPython's 1-byte fast path even for non-ASCII text
+        text_bytes = text_lower.encode()
+        return {skill for key, skill in self._skills_bytes if key in text_bytes}
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.utils.batching import RequestCoalescer
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_coalesced():
+    """Test that concurrent requests with the same key share one dispatch."""
+    calls = []
+    
+    async def dispatch(payload):
+        calls.append(payload)
+        await asyncio.sleep(0.01)
+        return payload.upper()
+    
+    coalescer = RequestCoalescer(dispatch)
+    results = await asyncio.gather(
+        coalescer.submit("a", "a"),
+        coalescer.submit("a", "a"),
+        coalescer.submit("b", "b")
+    )
+    
+    assert results == ["A", "A", "B"]
+    assert sorted(calls) == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_cancelled_dispatch_releases_waiters():
+    """Test that cancelling a dispatch cancels every caller instead of hanging."""
+    started = asyncio.Event()
+    
+    async def dispatch(payload):
+        started.set()
+        await asyncio.sleep(10)
+    
+    coalescer = RequestCoalescer(dispatch)
+    first = asyncio.create_task(coalescer.submit("a", "a"))
+    await started.wait()
+    joined = asyncio.create_task(coalescer.submit("a", "a"))
+    await asyncio.sleep(0)
+    
+    await coalescer.close()
+    
+    for task in (first, joined):
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 1)
+
+@pytest.mark.asyncio
+async def test_lone_request_is_not_delayed():
+    """Test that a request arriving alone is dispatched without waiting out the window."""
+    async def dispatch(payload):
+        return payload
+    
+    coalescer = RequestCoalescer(dispatch, max_wait=5)
+    assert await asyncio.wait_for(coalescer.submit("a", "a"), 1) == "a"
+    await coalescer.close()
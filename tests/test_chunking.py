@@ -0,0 +1,18 @@
+from src.utils.chunking import split_text
+
+def test_split_text_respects_size_and_word_boundaries():
+    """Test that chunks stay within the size limit and don't split words."""
+    words = [f"word{i}" for i in range(1000)]
+    chunks = split_text(" ".join(words), chunk_size=100, chunk_overlap=20)
+    
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert all(token in words for chunk in chunks for token in chunk.split())
+    assert chunks[0].split()[0] == "word0"
+    assert chunks[-1].split()[-1] == "word999"
+
+def test_split_text_overlaps_chunks():
+    """Test that consecutive chunks share text."""
+    chunks = split_text("a" * 2500, chunk_size=1000, chunk_overlap=200)
+    
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 900]
+    assert split_text("") == []
@@ -1,12 +1,60 @@
+import asyncio
+import threading
+import zlib
+import faiss
+import numpy as np
 import pytest
+from src.services import cv_analyzer
 from src.services.cv_analyzer import CVAnalyzer
 from src.models.cv import CV
 from src.models.job import Job
 
+class KeywordEmbeddings:
+    """Deterministic bag-of-words embeddings standing in for MiniLM."""
+    
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+    
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % self.dim] += 1.0
+        return (vector / max(np.linalg.norm(vector), 1e-12)).tolist()
+    
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+    
+    def embed_query(self, text):
+        return self._embed(text)
+
+class FixedEmbeddings:
+    """Embeddings returning preset vectors for known names."""
+    
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = 0
+    
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [self.vectors[text] for text in texts]
+
+def _unit_vector(cosine):
+    """2-D unit vector with the given cosine similarity to [1, 0]."""
+    return [cosine, float(np.sqrt(1 - cosine ** 2))]
+
 @pytest.fixture
 def analyzer():
     return CVAnalyzer()
 
+@pytest.fixture
+def offline_analyzer(monkeypatch):
+    """Analyzer with stub embeddings, for tests that make no HF calls."""
+    monkeypatch.setenv("HF_TOKEN", "test-token")
+    analyzer = CVAnalyzer()
+    analyzer.embeddings = KeywordEmbeddings()
+    yield analyzer
+    analyzer._pdf_executor.shutdown()
+
 @pytest.fixture
 def sample_cv():
     return CV(
@@ -44,4 +92,141 @@ async def test_analyze_cv_job_match(analyzer, sample_cv, sample_job):
     assert result.cv_id == sample_cv.id
     assert 0 <= result.fit_score <= 100
     assert len(result.matched_requirements) > 0
-    assert result.summary
\ No newline at end of file
+    assert result.summary
+
+@pytest.mark.asyncio
+async def test_score_cv_job_match(offline_analyzer, sample_cv, sample_job):
+    """Test CV-job scoring without the LLM summary."""
+    result = await offline_analyzer.score_cv_job_match(sample_cv, sample_job)
+    
+    assert result.fit_score == 100
+    assert result.matched_requirements == ["Python", "Django", "Docker", "AWS"]
+    assert result.missing_requirements == []
+    assert result.summary
+
+@pytest.mark.asyncio
+async def test_retrieve_cv_context_with_many_cvs_in_tenant(offline_analyzer):
+    """Test that retrieval finds a CV's own chunks in a tenant with many CVs."""
+    job = Job(title="Developer", company="Tech Corp", requirements=["Python"], location="Remote")
+    
+    # Many CVs that match the generic query better than the target CV
+    cvs = [
+        CV(id=f"cv-{i}", content=f"skills experience developer skills experience candidate{i}", skills=[], tenant_id="t")
+        for i in range(150)
+    ]
+    cvs.append(CV(id="target", content="Rust embedded firmware engineer", skills=[], tenant_id="t"))
+    
+    for cv in cvs:
+        text_embeddings = await offline_analyzer._embed_cv_chunks(cv.content)
+        await offline_analyzer._store_cv_in_vector_db(cv, text_embeddings)
+    
+    context = await offline_analyzer.retrieve_cv_context(cvs[-1], job)
+    
+    assert context == "Rust embedded firmware engineer"
+    # All CVs share one tenant index, which retrieval searches
+    assert offline_analyzer.tenant_stores["t"].index.ntotal == len(cvs)
+
+@pytest.mark.asyncio
+async def test_retrieval_after_ivfpq_migration(offline_analyzer, monkeypatch):
+    """Test that CVs indexed before and during the IVF+PQ migration stay retrievable."""
+    monkeypatch.setattr(cv_analyzer, "IVF_MIGRATION_THRESHOLD", 40)
+    monkeypatch.setattr(cv_analyzer, "IVF_INDEX_FACTORY", "IVF4,PQ8x4")
+    job = Job(title="Developer", company="Tech Corp", requirements=["Python"], location="Remote")
+    
+    # Hold training open so CVs can be added while it runs
+    training, release = threading.Event(), threading.Event()
+    build = CVAnalyzer._build_ivfpq_index
+    
+    def slow_build(vectors, metric_type):
+        training.set()
+        release.wait(5)
+        return build(vectors, metric_type)
+    
+    monkeypatch.setattr(offline_analyzer, "_build_ivfpq_index", slow_build)
+    
+    async def store(cv_id):
+        cv = CV(id=cv_id, content=f"{cv_id} python developer with backend experience", skills=[], tenant_id="t")
+        await offline_analyzer._store_cv_in_vector_db(cv, await offline_analyzer._embed_cv_chunks(cv.content))
+        return cv
+    
+    early = [await store(f"early{i}") for i in range(45)]
+    assert await asyncio.to_thread(training.wait, 5)
+    late = [await store(f"late{i}") for i in range(5)]
+    release.set()
+    await asyncio.gather(*offline_analyzer._background_tasks)
+    
+    index = offline_analyzer.tenant_stores["t"].index
+    assert isinstance(index, faiss.IndexIVFPQ)
+    assert index.ntotal == 50
+    for cv in (early[0], early[-1], late[0], late[-1]):
+        assert await offline_analyzer.retrieve_cv_context(cv, job) == cv.content
+
+@pytest.mark.asyncio
+async def test_embedding_model_loads_off_the_event_loop(offline_analyzer, monkeypatch):
+    """Test that the first embedding call builds the model in a worker thread, once."""
+    loaded_in = []
+    
+    def create_embeddings():
+        loaded_in.append(threading.current_thread())
+        return KeywordEmbeddings()
+    
+    monkeypatch.setattr(cv_analyzer, "create_embeddings", create_embeddings)
+    offline_analyzer.embeddings = None
+    
+    await asyncio.gather(*(offline_analyzer._embed_cv_chunks(f"Python developer {i}") for i in range(4)))
+    
+    assert len(loaded_in) == 1
+    assert loaded_in[0] is not threading.main_thread()
+
+def test_cv_cache_key_tracks_embedding_setup(monkeypatch):
+    """Test that changing the embedding backend or chunking gives a new cache key."""
+    monkeypatch.setenv("EMBEDDINGS_BACKEND", "torch")
+    torch_key = CVAnalyzer._cv_cache_key("abc")
+    
+    monkeypatch.setenv("EMBEDDINGS_BACKEND", "onnx")
+    onnx_key = CVAnalyzer._cv_cache_key("abc")
+    
+    monkeypatch.setattr(cv_analyzer, "CHUNK_SIZE", 500)
+    resized_key = CVAnalyzer._cv_cache_key("abc")
+    
+    assert len({torch_key, onnx_key, resized_key}) == 3
+    assert all(key.startswith("abc:") for key in (torch_key, onnx_key, resized_key))
+
+@pytest.mark.asyncio
+async def test_semantic_matching_is_opt_in(offline_analyzer):
+    """Test that lexical-only scoring never touches the embedding model."""
+    embeddings = FixedEmbeddings({})
+    offline_analyzer.embeddings = embeddings
+    offline_analyzer.semantic_matching = False
+    
+    matched = await offline_analyzer._match_requirements(["Kubernetes"], ["Container orchestration"])
+    
+    assert matched == set()
+    assert embeddings.calls == 0
+
+@pytest.mark.asyncio
+async def test_semantic_matching_thresholds(offline_analyzer):
+    """Test semantic matching accepts close multi-word requirements and rejects near-homonyms."""
+    offline_analyzer.semantic_matching = True
+    offline_analyzer.embeddings = FixedEmbeddings({
+        "kubernetes": _unit_vector(1.0),
+        "javascript": _unit_vector(1.0),
+        "container orchestration": _unit_vector(0.9),
+        # Near-homonym scores typical of MiniLM on short names
+        "java spring": _unit_vector(0.8)
+    })
+    
+    matched = await offline_analyzer._match_requirements(
+        ["Kubernetes", "JavaScript"], ["Container orchestration", "Java Spring"]
+    )
+    
+    assert matched == {"Container orchestration"}
+
+@pytest.mark.asyncio
+async def test_match_requirements_lexical(offline_analyzer):
+    """Test direct, partial and related-spelling requirement matches."""
+    matched = await offline_analyzer._match_requirements(
+        ["ReactJS", "PostgreSQL", "Python 3"], ["React.js", "Postgres", "Python", "Node.js"]
+    )
+    
+    assert matched == {"React.js", "Postgres", "Python"}
@@ -0,0 +1,28 @@
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from src.api.routes.cv import _read_text_upload, _spool_to_tempfile
+
+def test_spool_to_tempfile_enforces_size_limit():
+    """Test that oversized uploads are rejected while copying, without leaving a temp file."""
+    with pytest.raises(HTTPException) as exc_info:
+        _spool_to_tempfile(io.BytesIO(b"x" * 2048), max_size=1024)
+    assert exc_info.value.status_code == 413
+    
+    path = _spool_to_tempfile(io.BytesIO(b"x" * 512), max_size=1024)
+    try:
+        assert os.path.getsize(path) == 512
+    finally:
+        os.unlink(path)
+
+@pytest.mark.asyncio
+async def test_read_text_upload_enforces_size_limit():
+    """Test that oversized text uploads are rejected with 413."""
+    upload = UploadFile(file=io.BytesIO("é".encode() * 1024))
+    with pytest.raises(HTTPException) as exc_info:
+        await _read_text_upload(upload, max_size=1024)
+    assert exc_info.value.status_code == 413
+    
+    upload = UploadFile(file=io.BytesIO("Python Django".encode()))
+    assert await _read_text_upload(upload, max_size=1024) == "Python Django"
@@ -0,0 +1,12 @@
+from src.services import embeddings
+
+def test_torch_backend_configures_threads(monkeypatch):
+    """Test that the default torch backend sets its thread counts before loading the model."""
+    calls = []
+    monkeypatch.delenv("EMBEDDINGS_BACKEND", raising=False)
+    monkeypatch.setattr(embeddings, "_configure_torch_threads", lambda: calls.append("threads"))
+    monkeypatch.setattr(embeddings, "HuggingFaceEmbeddings", lambda **kwargs: calls.append("model"))
+    
+    embeddings.create_embeddings()
+    
+    assert calls == ["threads", "model"]
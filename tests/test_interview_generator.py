@@ -1,4 +1,7 @@
+import json
+from types import SimpleNamespace
 import pytest
+from src.services import interview_generator
 from src.services.interview_generator import InterviewGenerator
 from src.models.cv import CVAnalysisResult
 from src.models.job import Job
@@ -7,6 +10,12 @@ from src.models.job import Job
 def generator():
     return InterviewGenerator()
 
+@pytest.fixture
+def offline_generator(monkeypatch):
+    """Generator for tests that stub out every HF call."""
+    monkeypatch.setenv("HF_TOKEN", "test-token")
+    return InterviewGenerator()
+
 @pytest.fixture
 def high_score_analysis():
     return CVAnalysisResult(
@@ -56,4 +65,66 @@ async def test_generate_interview_low_score(generator, low_score_analysis, sampl
     assert assessment.fit_score == 25
     assert assessment.rejected
     assert len(assessment.questions) == 0
-    assert assessment.rejection_reason != ""
\ No newline at end of file
+    assert assessment.rejection_reason != ""
+
+@pytest.mark.asyncio
+async def test_generate_full(offline_generator, high_score_analysis, sample_job, monkeypatch):
+    """Test that the JSON summary and questions are used despite surrounding reasoning text."""
+    questions = [
+        "How have you structured a large Django project?",
+        "How do you profile a slow Python service?",
+        "How would you approach learning React on the job?",
+        "Describe a FastAPI endpoint you designed end to end."
+    ]
+    body = json.dumps({"summary": "Strong Python and Django background.", "questions": questions})
+    content = f"<think>The candidate matches most requirements.</think>\n{body}\nThat is my answer."
+    
+    async def chat_completion(client, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    
+    monkeypatch.setattr(interview_generator, "chat_completion", chat_completion)
+    summary, assessment = await offline_generator.generate_full(high_score_analysis, sample_job)
+    
+    assert summary == "Strong Python and Django background."
+    assert assessment.questions == questions
+    assert assessment.fit_score == 85
+    assert not assessment.rejected
+
+class StubStream:
+    """Async completion stream yielding preset content deltas."""
+    
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.consumed = 0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def __aiter__(self):
+        for delta in self.deltas:
+            self.consumed += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+@pytest.mark.asyncio
+async def test_stream_ignores_numbered_reasoning(offline_generator, monkeypatch):
+    """Test that numbered lines inside <think> don't end the stream before the answer."""
+    answer = [
+        "1. How do you structure Django apps?\n",
+        "2. How do you test FastAPI endpoints?\n",
+        "3. How do you profile Python code?\n",
+        "4. Scenario: production is down, what do you check first?\n"
+    ]
+    reasoning = ["<think>\n", "1. Look at skills\n", "2. Pick topics\n", "3. Check level\n", "4. Add scenario\n", "</think>\n"]
+    stream = StubStream(reasoning + answer + ["Trailing notes that should not be read\n"])
+    
+    async def chat_completion(client, **kwargs):
+        return stream
+    
+    monkeypatch.setattr(interview_generator, "chat_completion", chat_completion)
+    text = await offline_generator._stream_questions_text("prompt")
+    
+    assert text.strip() == "".join(answer).strip()
+    assert stream.consumed == len(reasoning) + len(answer)
@@ -0,0 +1,43 @@
+import pytest
+from src.api.routes.jobs import scrape_jobs
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+class FakeRedis:
+    """Minimal async Redis stand-in recording writes."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    async def get(self, key):
+        return self.store.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+@pytest.mark.asyncio
+async def test_sample_fallback_is_not_cached(monkeypatch):
+    """Test that sample jobs served after a SerpAPI failure are not written to Redis."""
+    scraper = LinkedInScraper(serp_api_key="test-key")
+    redis = FakeRedis()
+    
+    def failing_search(params):
+        raise ConnectionError("SerpAPI unavailable")
+    
+    monkeypatch.setattr(scraper, "_perform_serp_search", failing_search)
+    
+    response = await scrape_jobs(query="Python Developer", location="", limit=10, scraper=scraper, redis=redis)
+    
+    assert response.status_code == 200
+    assert redis.store == {}
+
+@pytest.mark.asyncio
+async def test_serpapi_results_are_cached(monkeypatch):
+    """Test that genuine SerpAPI results are written to Redis."""
+    scraper = LinkedInScraper(serp_api_key="test-key")
+    redis = FakeRedis()
+    results = {"jobs_results": [{"title": "Python Developer", "company_name": "Acme", "location": "Remote"}]}
+    monkeypatch.setattr(scraper, "_perform_serp_search", lambda params: results)
+    
+    await scrape_jobs(query="Python Developer", location="", limit=10, scraper=scraper, redis=redis)
+    
+    assert list(redis.store) == ["jobs:Python Developer::10"]
@@ -0,0 +1,43 @@
+import os
+from concurrent.futures import Executor
+import fitz
+import pytest
+from src.utils.pdf_text import PARALLEL_MIN_PAGES, create_pdf_executor, extract_text
+
+class RecordingExecutor(Executor):
+    """Runs tasks inline and records the source each task receives."""
+    
+    def __init__(self):
+        self.sources = []
+    
+    def map(self, fn, sources, *iterables):
+        sources = list(sources)
+        self.sources.extend(sources)
+        return map(fn, sources, *iterables)
+
+@pytest.fixture
+def pdf_bytes():
+    """A PDF long enough to be split across workers."""
+    doc = fitz.open()
+    for number in range(PARALLEL_MIN_PAGES + 3):
+        doc.new_page().insert_text((72, 72), f"Page {number}")
+    return doc.tobytes()
+
+def test_parallel_extraction_matches_sequential(pdf_bytes):
+    """Test that splitting pages across processes preserves page order."""
+    with create_pdf_executor() as executor:
+        parallel = extract_text(pdf_bytes, executor)
+    
+    assert parallel == extract_text(pdf_bytes)
+    assert "Page 0" in parallel and f"Page {PARALLEL_MIN_PAGES + 2}" in parallel
+
+def test_workers_receive_a_temp_file_path(pdf_bytes):
+    """Test that PDF bytes are written once and workers get a path, not the bytes."""
+    executor = RecordingExecutor()
+    text = extract_text(pdf_bytes, executor)
+    
+    assert text == extract_text(pdf_bytes)
+    assert len(set(executor.sources)) == 1
+    path = executor.sources[0]
+    assert isinstance(path, str)
+    assert not os.path.exists(path)
@@ -32,4 +32,28 @@ def test_normalize_job_data(scraper):
     assert job.title == 'Senior Python Developer'
     assert job.company == 'Tech Corp'
     assert 'Python' in job.requirements
-    assert job.location == 'San Francisco, CA'
\ No newline at end of file
+    assert job.location == 'San Francisco, CA'
+
+def test_extract_skills(scraper):
+    """Test skill extraction from a job description."""
+    skills = scraper._extract_skills(
+        "Strong Django and PostgreSQL background, Kubernetes (k8s) and continuous integration."
+    )
+    assert {'Django', 'PostgreSQL', 'Kubernetes', 'CI/CD'} <= set(skills)
+
+@pytest.mark.asyncio
+async def test_serpapi_skips_only_invalid_rows(monkeypatch):
+    """Test that one malformed SerpAPI row doesn't discard the valid ones."""
+    scraper = LinkedInScraper(serp_api_key="test-key")
+    results = {
+        "jobs_results": [
+            {"title": "Python Developer", "company_name": "Acme", "location": "Remote"},
+            {"title": "Broken Row", "company_name": "Acme", "location": {"city": "Nowhere"}},
+            {"title": "Go Developer", "company_name": "Initech", "location": "Berlin"}
+        ]
+    }
+    monkeypatch.setattr(scraper, "_perform_serp_search", lambda params: results)
+    
+    jobs = await scraper.scrape_jobs("Developer")
+    
+    assert [job.title for job in jobs] == ["Python Developer", "Go Developer"]